@@ -1,18 +1,39 @@
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import ExecuteRequest, ExecuteResponse
-from app.services.function_registry import function_registry
+from fastapi import APIRouter, Depends, HTTPException, Request
+from app.models.schemas import ExecuteRequest, ExecuteResponse, FunctionResult
+from app.services.function_registry import get_function_registry
 from app.services.rag_service import RAGService
 from loguru import logger
-from pydantic import BaseModel
-from typing import Dict, Any, Callable
-import inspect
-import importlib.util
-import tempfile
-import os
-import json
+from pydantic import BaseModel, ValidationError
+from collections import OrderedDict
+from types import ModuleType
+from typing import Dict, Any, List, Optional
+import asyncio
+import hashlib
+import orjson
 
 router = APIRouter()
-rag_service = RAGService()
+
+# Modules built from custom function code, keyed on a digest of the source;
+# least recently used entries are evicted once the cap is reached
+_CODE_CACHE_SIZE = 128
+_code_cache: "OrderedDict[bytes, ModuleType]" = OrderedDict()
+
+def get_rag_service(request: Request) -> RAGService:
+    """Dependency returning the RAG service created in the app lifespan"""
+    return request.app.state.rag
+
+def _dumps(obj: Any, pretty: bool = False) -> str:
+    """Serialize to compact JSON, or indented JSON when explicitly requested"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+
+def _execute_response(function_name: str, code: str, status: str, error: str = None) -> Dict[str, Any]:
+    """Build an ExecuteResponse payload; FastAPI serializes it straight to JSON bytes through response_model"""
+    return {
+        "function": function_name,
+        "code": code,
+        "status": status,
+        "error": error
+    }
 
 @router.post(
     "/execute",
@@ -35,7 +56,11 @@ rag_service = RAGService()
     """,
     response_description="Returns the executed function details and status",
 )
-async def execute_function(request: ExecuteRequest):
+async def execute_function(
+    request: ExecuteRequest,
+    pretty: bool = False,
+    rag_service: RAGService = Depends(get_rag_service)
+):
     """
     Execute a function based on the provided prompt.
     
@@ -45,65 +70,45 @@ async def execute_function(request: ExecuteRequest):
     - "What's the current time?"
     - "List files in current directory"
     - "Open Chrome browser"
+
+    Pass `?pretty=1` to get the result code as indented JSON.
     """
     try:
         # Find the most relevant function using RAG with context
-        function_match = rag_service.get_best_match(request.prompt)
+        function_match = await asyncio.to_thread(rag_service.get_best_match, request.prompt)
         if not function_match:
             raise HTTPException(status_code=404, detail="No matching function found for the given prompt")
 
-        # Execute the function
+        # Call the matched function directly
+        function_name, entry, _ = function_match
+        result = await asyncio.to_thread(get_function_registry().invoke, function_name, entry)
+    
+        # Add to session history
+        rag_service.add_to_history(request.prompt, function_name, result)
+    
+        # Parse the result; only a JSON object can report an error, other JSON values pass through
         try:
-            function_name = function_match["name"]
-            result = function_registry.execute(function_name)
-            
-            # Add to session history
-            rag_service.add_to_history(request.prompt, function_name, result)
-            
-            # Parse the result
-            try:
-                result_json = json.loads(result)
-                if "error" in result_json:
-                    return ExecuteResponse(
-                        function=function_name,
-                        code=result,
-                        status="error",
-                        error=result_json["error"]
-                    )
-                elif "value" in result_json:
-                    return ExecuteResponse(
-                        function=function_name,
-                        code=result,
-                        status="success",
-                        error=None
-                    )
-                else:
-                    return ExecuteResponse(
-                        function=function_name,
-                        code=result,
-                        status="success",
-                        error=None
-                    )
-            except json.JSONDecodeError:
-                # If result is not JSON, wrap it in a value field
-                return ExecuteResponse(
-                    function=function_name,
-                    code=json.dumps({"value": result}, indent=2),
-                    status="success",
-                    error=None
-                )
-            
-        except Exception as e:
-            logger.error(f"Error executing function {function_name}: {str(e)}")
-            return ExecuteResponse(
-                function=function_name,
-                code=json.dumps({"error": str(e)}, indent=2),
-                status="error",
-                error=str(e)
-            )
+            if result[:1] == "{":
+                error = FunctionResult.model_validate_json(result).error
+            else:
+                orjson.loads(result)
+                error = None
+        except (ValidationError, orjson.JSONDecodeError):
+            # If result is not JSON, wrap it in a value field
+            return _execute_response(function_name, _dumps({"value": result}, pretty), "success")
+
+        if pretty:
+            result = _dumps(orjson.loads(result), pretty)
 
+        if error is not None:
+            # Report non-string errors as JSON rather than as a Python repr
+            return _execute_response(function_name, result, "error", error if isinstance(error, str) else _dumps(error))
+        return _execute_response(function_name, result, "success")
+
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in execute_function: {str(e)}")
+        logger.error("Error in execute_function: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 class CustomFunction(BaseModel):
@@ -111,11 +116,14 @@ class CustomFunction(BaseModel):
     code: str
     description: str
     category: str = "Custom"
-    parameters: Dict[str, Any] = None
-    examples: list = None
+    parameters: Optional[Dict[str, Any]] = None
+    examples: Optional[List[str]] = None
 
 @router.post("/register-function")
-async def register_function(function: CustomFunction):
+async def register_function(
+    function: CustomFunction,
+    rag_service: RAGService = Depends(get_rag_service)
+):
     """
     Register a custom user-defined function.
     
@@ -129,15 +137,17 @@ async def register_function(function: CustomFunction):
             - examples: List of example prompts
     """
     try:
-        # Create a temporary file to store the function code
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(function.code)
-            temp_path = f.name
-
-        # Import the function from the temporary file
-        spec = importlib.util.spec_from_file_location("custom_function", temp_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        # Compile and execute the function code in memory, reusing the module for known snippets
+        digest = hashlib.blake2b(function.code.encode("utf-8"), digest_size=16).digest()
+        module = _code_cache.get(digest)
+        if module is None:
+            module = ModuleType(f"custom_{function.name}")
+            exec(compile(function.code, "<custom_function>", "exec"), module.__dict__)
+            _code_cache[digest] = module
+            if len(_code_cache) > _CODE_CACHE_SIZE:
+                _code_cache.popitem(last=False)
+        else:
+            _code_cache.move_to_end(digest)
 
         # Get the function object
         func = getattr(module, function.name)
@@ -147,7 +157,7 @@ async def register_function(function: CustomFunction):
             raise ValueError(f"'{function.name}' is not a callable function")
         
         # Register the function
-        function_registry.register_custom_function(
+        get_function_registry().register_custom_function(
             name=function.name,
             func=func,
             description=function.description,
@@ -156,11 +166,11 @@ async def register_function(function: CustomFunction):
             examples=function.examples
         )
 
-        # Clean up the temporary file
-        os.unlink(temp_path)
+        # Embed just the new function into the vector store
+        await asyncio.to_thread(rag_service.sync_functions)
 
         return {"message": f"Successfully registered function: {function.name}"}
 
     except Exception as e:
-        logger.error(f"Error registering custom function: {e}")
+        logger.error("Error registering custom function: {}", e)
         raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
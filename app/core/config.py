@@ -7,10 +7,34 @@ class Settings(BaseSettings):
     # API Settings
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "AlgoRoot Function Execution API"
+    # Server processes started by app.main. The registry, session history and caches live in one
+    # process, and the Chroma store and hash file are not safe for concurrent writers, so more
+    # than one worker needs that state shared first (e.g. a Chroma server and an external store)
+    WORKERS: int = 1
     
     # Vector Database Settings
     CHROMA_DB_PATH: str = str(Path("data/chroma_db"))
+    # Any sentence-transformers model; changing it re-embeds the stored functions on the next start.
+    # A 3-layer distill such as paraphrase-MiniLM-L3-v2 halves the encoder cost per query, but check
+    # top-1 accuracy on the registered examples first, and that the repo ships EMBEDDING_ONNX_FILE
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    # Inference backend for the embedding model: "torch", "onnx" or "openvino"
+    EMBEDDING_BACKEND: str = "onnx"
+    # ONNX export to load from the model repo; the dynamically quantized int8 one is fastest on CPU
+    EMBEDDING_ONNX_FILE: Optional[str] = "onnx/model_quint8_avx2.onnx"
+    # ONNX Runtime execution provider for the embedding model
+    EMBEDDING_ONNX_PROVIDER: str = "CPUExecutionProvider"
+    # Dynamically quantize the torch backend's Linear layers to int8 when running on CPU
+    QUANTIZE_EMBEDDING: bool = True
+    # Intra-op threads for embedding; unset keeps the runtime default, and running app.main with
+    # several WORKERS sets it to an even share of the cores per worker
+    EMBEDDING_THREADS: Optional[int] = None
+    EMBEDDING_CACHE_SIZE: int = 2048
+    RETRIEVAL_CACHE_SIZE: int = 512
+    # Registries up to this size are searched in memory instead of through Chroma
+    EXACT_SEARCH_MAX_FUNCTIONS: int = 10000
+    # Relevance boost for functions used in the session history
+    HISTORY_BOOST: float = 0.05
     
     # Logging Settings
     LOG_LEVEL: str = "INFO"
@@ -18,6 +42,13 @@ class Settings(BaseSettings):
     
     # Function Registry Settings
     MAX_RETRIEVAL_RESULTS: int = 3
+    EXECUTOR_WORKERS: int = 8
+    
+    # Semantic Cache Settings
+    PROXIMITY_TAU: float = 0.02
+    PROXIMITY_CAPACITY: int = 1024
+    # Looser threshold for reusing a whole ranking; its capacity is RETRIEVAL_CACHE_SIZE
+    RETRIEVAL_PROXIMITY_TAU: float = 0.05
     
     class Config:
         case_sensitive = True
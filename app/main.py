@@ -1,12 +1,32 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.routes import router
 from app.core.logging import logger
+from app.services.rag_service import RAGService
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Starting up AlgoRoot Function Execution API")
+    # Bounded pool for the blocking work offloaded by the routes
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.EXECUTOR_WORKERS)
+    )
+    # Load the model and embed the function registry before the first request arrives
+    app.state.rag = await asyncio.to_thread(RAGService)
+    await asyncio.to_thread(app.state.rag.warmup)
+    yield
+    logger.info("Cache stats: {}", app.state.rag.cache_stats())
+    logger.info("Shutting down AlgoRoot Function Execution API")
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -21,10 +41,19 @@ app.add_middleware(
 # Include API routes
 app.include_router(router, prefix=settings.API_V1_STR)
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Starting up AlgoRoot Function Execution API")
+if __name__ == "__main__":
+    import uvicorn
+
+    if settings.WORKERS > 1:
+        # Workers re-read the settings from the environment, so give each an even share of the cores
+        os.environ.setdefault("EMBEDDING_THREADS", str(max(1, (os.cpu_count() or 1) // settings.WORKERS)))
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("Shutting down AlgoRoot Function Execution API") 
\ No newline at end of file
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        # uvloop is not available on Windows
+        loop="asyncio" if os.name == "nt" else "uvloop",
+        http="httptools",
+        workers=settings.WORKERS
+    )
\ No newline at end of file
@@ -1,7 +1,22 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
 from typing import Optional, Dict, Any, List
 
-class ExecuteRequest(BaseModel):
+_EXAMPLE_CODE = '''import os\nimport sys\nfrom typing import Any, Dict\n\n"""\nGenerated code for function: open_calculator\nDescription: Opens the system calculator\nCategory: Application Control\nParameters: None\nExamples: Open calculator, Launch calculator, Start calculator\n"""\n\ndef main():\n    try:\n        result = open_calculator()\n        if result is not None:\n            print(json.dumps(result, indent=2))\n        else:\n            print("Function open_calculator executed successfully.")\n    except Exception as e:\n        print(f"Error executing open_calculator: {e}")\n        sys.exit(1)\n\nif __name__ == "__main__":\n    main()'''
+
+# Request/response models are built on every /execute call, so they are
+# slotted, frozen dataclasses rather than BaseModels
+@dataclass(
+    frozen=True,
+    slots=True,
+    config=ConfigDict(json_schema_extra={
+        "example": {
+            "prompt": "Open calculator",
+            "context": None
+        }
+    })
+)
+class ExecuteRequest:
     prompt: str = Field(
         ...,
         description="Natural language prompt describing the function to execute",
@@ -18,15 +33,19 @@ class ExecuteRequest(BaseModel):
         description="Optional context data for function execution"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "prompt": "Open calculator",
-                "context": None
-            }
+@dataclass(
+    frozen=True,
+    slots=True,
+    config=ConfigDict(json_schema_extra={
+        "example": {
+            "function": "open_calculator",
+            "code": _EXAMPLE_CODE,
+            "status": "success",
+            "error": None
         }
-
-class ExecuteResponse(BaseModel):
+    })
+)
+class ExecuteResponse:
     function: str = Field(
         ...,
         description="Name of the executed function"
@@ -44,19 +63,15 @@ class ExecuteResponse(BaseModel):
         description="Error message if execution failed"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "function": "open_calculator",
-                "code": '''import os\nimport sys\nfrom typing import Any, Dict\n\n"""\nGenerated code for function: open_calculator\nDescription: Opens the system calculator\nCategory: Application Control\nParameters: None\nExamples: Open calculator, Launch calculator, Start calculator\n"""\n\ndef main():\n    try:\n        result = open_calculator()\n        if result is not None:\n            print(json.dumps(result, indent=2))\n        else:\n            print("Function open_calculator executed successfully.")\n    except Exception as e:\n        print(f"Error executing open_calculator: {e}")\n        sys.exit(1)\n\nif __name__ == "__main__":\n    main()''',
-                "status": "success",
-                "error": None
-            }
-        }
-
 class FunctionMetadata(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(..., description="Name of the function")
     description: str = Field(..., description="Description of what the function does")
     category: str = Field(..., description="Category of the function (e.g., 'Application Control', 'System Monitoring')")
     parameters: Optional[Dict[str, Any]] = Field(default=None, description="Function parameters if any")
-    examples: Optional[List[str]] = Field(default=None, description="Example prompts that would trigger this function") 
\ No newline at end of file
+    examples: Optional[List[str]] = Field(default=None, description="Example prompts that would trigger this function")
+
+class FunctionResult(BaseModel):
+    value: Optional[Any] = Field(default=None, description="Value returned by the function")
+    error: Optional[Any] = Field(default=None, description="Error reported by the function, if it failed")
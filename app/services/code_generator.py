@@ -1,36 +1,19 @@
-from typing import Dict, Any
+from typing import Dict, Any, FrozenSet, Tuple
+from functools import lru_cache
+from string import Template
+import re
 from loguru import logger
 
-class CodeGenerator:
-    @staticmethod
-    def generate_code(function_name: str, context: Dict[str, Any]) -> str:
-        """
-        Generate executable Python code for a function.
-        
-        Args:
-            function_name: Name of the function to execute
-            context: Function metadata and context
-            
-        Returns:
-            The actual result of the function execution
-        """
-        try:
-            # Import necessary modules
-            imports = CodeGenerator._generate_imports(function_name)
-            
-            # Get the function call
-            function_call = CodeGenerator._generate_function_call(function_name, context)
-            
-            # Generate the complete code
-            code = f"""
-{imports}
+# Skeleton of every generated script; runtime f-string fields stay literal
+_BASE_TEMPLATE = Template("""
+$imports
 
-{CodeGenerator._generate_docstring(function_name, context)}
+$docstring
 
 def main():
     try:
         # Execute the function
-        result = {function_call}
+        result = $function_call
         
         # Handle the result
         if result is not None:
@@ -42,66 +25,121 @@ def main():
             print("Function executed successfully.")
             
     except Exception as e:
-        print(f"Error executing {function_name}: {e}")
+        print(f"Error executing $function_name: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
     main()
-"""
+""")
+
+# Function call templates keyed on a keyword in the function name; the first match wins
+_CALL_TEMPLATES: Dict[str, str] = {
+    "time": "datetime.now().strftime('%H:%M:%S')",
+    "date": "datetime.now().strftime('%Y-%m-%d')",
+    "system": """
+{
+    'system': platform.system(),
+    'release': platform.release(),
+    'version': platform.version(),
+    'machine': platform.machine(),
+    'processor': platform.processor()
+}""",
+    "cpu": "psutil.cpu_percent(interval=1)",
+    "ram": "psutil.virtual_memory().percent",
+    "disk": "psutil.disk_usage('/').percent",
+    "network": """
+{
+    'interfaces': [netiface.ifaddrs(iface) for iface in netiface.interfaces()]
+}""",
+}
+
+_BASE_IMPORTS = "import os\nimport sys\nfrom typing import Any, Dict\nimport json"
+
+# Extra import blocks, each added once when any of its keywords is in the function name
+_IMPORT_EXTRA: Tuple[Tuple[FrozenSet[str], str], ...] = (
+    (frozenset({"time", "date"}), "\nfrom datetime import datetime"),
+    (frozenset({"system", "cpu", "ram"}), "\nimport psutil\nimport platform"),
+)
+
+# Single scan for every template keyword; no keyword can overlap another, so findall sees them all
+_KEYWORD_RE = re.compile("|".join(_CALL_TEMPLATES))
+_KEYWORD_PRIORITY: Dict[str, int] = {keyword: i for i, keyword in enumerate(_CALL_TEMPLATES)}
+
+class CodeGenerator:
+    @staticmethod
+    def generate_code(function_name: str, context: Dict[str, Any]) -> str:
+        """
+        Generate executable Python code for a function.
+        
+        Args:
+            function_name: Name of the function to execute
+            context: Function metadata and context
+            
+        Returns:
+            The actual result of the function execution
+        """
+        context_key = (
+            context.get("description"),
+            context.get("category"),
+            tuple((context.get("parameters") or {}).keys()),
+            tuple(context.get("examples") or ())
+        )
+        return CodeGenerator.generate_code_cached(function_name, context_key)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def generate_code_cached(function_name: str, context_key: tuple) -> str:
+        """
+        Generate executable Python code for a function, memoized on its metadata.
+        
+        Args:
+            function_name: Name of the function to execute
+            context_key: Hashable (description, category, parameter names, examples) tuple
+            
+        Returns:
+            The generated Python code
+        """
+        try:
+            description, category, parameters, examples = context_key
+            context = {
+                key: value
+                for key, value in (
+                    ("description", description),
+                    ("category", category),
+                    ("parameters", dict.fromkeys(parameters)),
+                    ("examples", list(examples))
+                )
+                if value is not None
+            }
+            code = _BASE_TEMPLATE.substitute(
+                imports=CodeGenerator._generate_imports(function_name),
+                docstring=CodeGenerator._generate_docstring(function_name, context),
+                function_call=CodeGenerator._generate_function_call(function_name, context),
+                function_name=function_name
+            )
             return code
             
         except Exception as e:
-            logger.error(f"Error generating code: {e}")
+            logger.error("Error generating code: {}", e)
             raise
 
     @staticmethod
     def _generate_imports(function_name: str) -> str:
         """Generate necessary imports based on function name"""
-        imports = [
-            "import os",
-            "import sys",
-            "from typing import Any, Dict",
-            "import json"
-        ]
-        
-        # Add specific imports based on function name
-        if "time" in function_name or "date" in function_name:
-            imports.append("from datetime import datetime")
-        if "system" in function_name or "cpu" in function_name or "ram" in function_name:
-            imports.append("import psutil")
-            imports.append("import platform")
-            
-        return "\n".join(imports)
+        keywords = set(_KEYWORD_RE.findall(function_name))
+        imports = _BASE_IMPORTS
+        for group, extra in _IMPORT_EXTRA:
+            if not keywords.isdisjoint(group):
+                imports += extra
+        return imports
 
     @staticmethod
     def _generate_function_call(function_name: str, context: Dict[str, Any]) -> str:
         """Generate the function call with proper parameters"""
-        if "time" in function_name:
-            return "datetime.now().strftime('%H:%M:%S')"
-        elif "date" in function_name:
-            return "datetime.now().strftime('%Y-%m-%d')"
-        elif "system" in function_name:
-            return """
-{
-    'system': platform.system(),
-    'release': platform.release(),
-    'version': platform.version(),
-    'machine': platform.machine(),
-    'processor': platform.processor()
-}"""
-        elif "cpu" in function_name:
-            return "psutil.cpu_percent(interval=1)"
-        elif "ram" in function_name:
-            return "psutil.virtual_memory().percent"
-        elif "disk" in function_name:
-            return "psutil.disk_usage('/').percent"
-        elif "network" in function_name:
-            return """
-{
-    'interfaces': [netiface.ifaddrs(iface) for iface in netiface.interfaces()]
-}"""
-        else:
+        keywords = _KEYWORD_RE.findall(function_name)
+        if not keywords:
             return f"{function_name}()"
+        return _CALL_TEMPLATES[min(keywords, key=_KEYWORD_PRIORITY.__getitem__)]
 
     @staticmethod
     def _generate_docstring(function_name: str, context: Dict[str, Any]) -> str:
@@ -2,18 +2,101 @@ import os
 import webbrowser
 import psutil
 import subprocess
+import shutil
+import shlex
 import platform
-import json
+import inspect
+import orjson
+import time
+import sys
+import threading
+import re
+import socket
 from datetime import datetime
-from typing import Dict, Any, Callable
+from itertools import islice, groupby
+from typing import Dict, Any, Callable, Optional, NamedTuple, Tuple, Pattern, Iterable, FrozenSet, Set
 from app.models.schemas import FunctionMetadata
 from loguru import logger
 
+_GIB = 1 << 30
+_INV_GIB = 1.0 / _GIB
+
+# Address family names for network info; str() of an IntEnum differs across Python versions
+_FAMILY_NAMES: Dict[int, str] = {family: family.name for family in socket.AddressFamily}
+
+def _dumps(obj: Any) -> str:
+    """Serialize to compact JSON; the API indents it only when a client asks for pretty output"""
+    return orjson.dumps(obj).decode()
+
+class _RawJSON:
+    """Marks a function result that is already serialized JSON"""
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+def _raw(obj: Any) -> _RawJSON:
+    """Serialize to JSON, marked as ready to return as-is"""
+    return _RawJSON(_dumps(obj))
+
+class _ExecPlan(NamedTuple):
+    no_args: bool  # Callable without arguments, per its signature
+    is_sysmon: bool  # In the System Monitoring category
+    missing_err: Optional[str]  # Serialized "requires parameters" error, if it takes any
+
+# A registered callable with its call plan, as stored in the dispatch table
+DispatchEntry = Tuple[Callable, _ExecPlan]
+
+class MatchTerms(NamedTuple):
+    """Lowercased text a prompt is matched against, precomputed per function"""
+    examples: Tuple[str, ...]
+    name_phrase: str  # Function name with underscores as spaces
+    description: str
+
 class FunctionRegistry:
     def __init__(self):
         self.functions: Dict[str, Callable] = {}
         self.metadata: Dict[str, FunctionMetadata] = {}
+        # Callable and call plan per function, so execution needs a single lookup
+        self._dispatch: Dict[str, DispatchEntry] = {}
+        # Vector store document and metadata per function, composed once at registration
+        self._doc_cache: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        # Lowercased prompt-matching terms per function, and the example index built from them on demand
+        self._match_terms: Dict[str, MatchTerms] = {}
+        self._example_index: Optional[Tuple[Dict[str, str], Optional[Pattern[str]]]] = None
+        # Functions owning each word of the function names, also built on demand
+        self._name_words: Optional[Dict[str, FrozenSet[str]]] = None
+        # Platform details never change for the life of the process
+        self._static_sys = {
+            'system': platform.system(),
+            'release': platform.release(),
+            'version': platform.version(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': psutil.cpu_count()
+        }
+        # Serialized _get_system_info result, built on first use
+        self._sysinfo_json: Optional[_RawJSON] = None
+        # Seed the CPU usage counters so the first non-blocking sample is meaningful
+        psutil.cpu_percent(interval=None)
+        # No sample yet, so the first call takes a real one however soon it comes
+        self._cpu_sample: Tuple[float, float] = (float("-inf"), 0.0)
+        # Application launch commands for this platform, resolved to absolute paths once
+        if os.name == 'nt':  # Windows
+            self._app_cmds = {"calculator": ["calc.exe"], "notepad": ["notepad.exe"], "vscode": ["code"]}
+        else:  # Linux/Mac
+            self._app_cmds = {
+                app: [shutil.which(exe) or exe]
+                for app, exe in (("calculator", "gnome-calculator"), ("notepad", "gedit"), ("vscode", "code"))
+            }
+        # Serialized network interface listing and when it was taken; addresses rarely change
+        self._net_cache: Tuple[float, Optional[_RawJSON]] = (0.0, None)
+        # Local timezone name, refreshed hourly to follow DST changes
+        self._tzname = datetime.now().astimezone().tzinfo.tzname(None)
+        self._tz_hour = int(time.time() // 3600)
         self._register_functions()
+        # Everything registered after the built-ins is a custom function
+        self._builtin_count = len(self.functions)
 
     def execute(self, function_name: str, **kwargs) -> Any:
         """
@@ -30,45 +113,57 @@ class FunctionRegistry:
             KeyError: If the function is not registered
             Exception: Any exception raised by the function execution
         """
-        if function_name not in self.functions:
+        # One probe of a small dict keyed by interned names: the string hash is cached and the
+        # key compare is an identity check, so an index table or perfect hash would not be faster
+        entry = self._dispatch.get(function_name)
+        if entry is None:
             raise KeyError(f"Function '{function_name}' not found in registry")
         
-        try:
-            func = self.functions[function_name]
-            
-            # Get function metadata
-            metadata = self.metadata[function_name]
+        func, plan = entry
+        return self._run(function_name, func, plan, **kwargs)
+
+    def invoke(self, function_name: str, entry: DispatchEntry, **kwargs) -> Any:
+        """
+        Execute an already resolved function, skipping the registry lookup.
+        
+        Args:
+            function_name: Name of the function, used in error messages
+            entry: The function's dispatch entry, as returned by get_entry
+            **kwargs: Arguments to pass to the function
             
-            # For system monitoring functions, try to execute without parameters
-            if metadata.category == "System Monitoring":
-                try:
-                    result = func()
-                except TypeError:
-                    # If function requires parameters, try with empty kwargs
-                    result = func(**kwargs)
+        Returns:
+            The result of the function execution as a JSON string
+        """
+        func, plan = entry
+        return self._run(function_name, func, plan, **kwargs)
+
+    def _run(self, function_name: str, func: Callable, plan: _ExecPlan, **kwargs) -> Any:
+        """Call a function according to its plan and serialize the result"""
+        try:
+            # For system monitoring functions, execute without parameters when the signature allows it
+            if plan.is_sysmon:
+                result = func() if plan.no_args else func(**kwargs)
             else:
                 # For other functions, check if parameters are required
-                if metadata.parameters and not kwargs:
-                    return json.dumps({
-                        "error": f"Function '{function_name}' requires parameters: {', '.join(metadata.parameters.keys())}"
-                    }, indent=2)
+                if plan.missing_err and not kwargs:
+                    return plan.missing_err
                 result = func(**kwargs)
             
-            # If result is already a JSON string, return it
-            if isinstance(result, str) and result.startswith('{'):
-                return result
+            # If result is already serialized JSON, return it
+            if type(result) is _RawJSON:
+                return result.text
                 
             # Format the result based on its type
             if isinstance(result, (dict, list)):
-                return json.dumps(result, indent=2)
+                return _dumps(result)
             elif isinstance(result, (int, float)):
-                return json.dumps({"value": f"{result:.2f}%"}, indent=2)
+                return _dumps({"value": f"{result:.2f}%"})
             else:
-                return json.dumps({"value": str(result)}, indent=2)
+                return _dumps({"value": str(result)})
                 
         except Exception as e:
-            logger.error(f"Error executing function {function_name}: {str(e)}")
-            return json.dumps({"error": str(e)}, indent=2)
+            logger.error("Error executing function {}: {}", function_name, e)
+            return _dumps({"error": str(e)})
 
     def _register_functions(self):
         """Register all available functions"""
@@ -270,132 +365,189 @@ class FunctionRegistry:
         description: str,
         category: str,
         parameters: Dict[str, Any] = None,
-        examples: list = None
+        examples: list = None,
+        validate: bool = False
     ):
-        self.functions[name] = func
-        self.metadata[name] = FunctionMetadata(
+        # Intern the name so every table, and the ids the RAG service hands back, share one
+        # string object and lookups hit CPython's identity fast path
+        name = sys.intern(name)
+        # Categories repeat across functions and are compared on every ranking, so share them too
+        category = sys.intern(category)
+        # The built-ins pass trusted literals, so only custom functions pay for validation
+        metadata = (FunctionMetadata if validate else FunctionMetadata.model_construct)(
             name=name,
             description=description,
             category=category,
             parameters=parameters,
             examples=examples
         )
+        sig_params = inspect.signature(func).parameters.values()
+        plan = _ExecPlan(
+            no_args=not any(
+                p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) and p.default is p.empty
+                for p in sig_params
+            ) and not any(p.kind == p.VAR_KEYWORD for p in sig_params),
+            is_sysmon=category == "System Monitoring",
+            missing_err=_dumps({
+                "error": f"Function '{name}' requires parameters: {', '.join(parameters.keys())}"
+            }) if parameters else None
+        )
+
+        # Create a rich text description combining all metadata
+        doc = "\n".join((
+            f"Function: {name}",
+            f"Description: {description}",
+            f"Category: {category}",
+            f"Examples: {', '.join(examples or [])}",
+            f"Parameters: {', '.join(parameters) if parameters else 'None'}"
+        ))
+        # Format metadata as strings to comply with ChromaDB requirements
+        doc_metadata = {
+            "name": str(name),
+            "category": str(category),
+            "description": str(description),
+            "parameters": ", ".join(parameters) if parameters else "None",
+            "examples": str(examples) if examples else "None"
+        }
+        terms = MatchTerms(
+            examples=tuple(example.lower() for example in examples or ()),
+            name_phrase=name.replace('_', ' ').lower(),
+            description=description.lower()
+        )
+
+        # Publish only once everything is derived, so a bad input cannot leave the function half registered
+        self.functions[name] = func
+        self.metadata[name] = metadata
+        self._dispatch[name] = func, plan
+        self._doc_cache[name] = doc, doc_metadata
+        self._match_terms[name] = terms
+        self._example_index = None
+        self._name_words = None
 
     # Application Control Functions
     def _open_chrome(self):
         webbrowser.open("https://www.google.com")
         logger.info("Chrome browser opened successfully")
 
-    def _open_calculator(self):
+    def _launch(self, app: str):
+        """Start an application without going through a shell"""
+        cmd = self._app_cmds[app]
         if os.name == 'nt':  # Windows
-            os.system("calc")
+            os.startfile(cmd[0])
         else:  # Linux/Mac
-            subprocess.Popen(["gnome-calculator"])
+            # Absolute path, default fds and no stdio redirection let subprocess use posix_spawn
+            subprocess.Popen(cmd, close_fds=False)
+
+    def _open_calculator(self):
+        self._launch("calculator")
         logger.info("Calculator opened successfully")
 
     def _open_notepad(self):
-        if os.name == 'nt':  # Windows
-            os.system("notepad")
-        else:  # Linux/Mac
-            subprocess.Popen(["gedit"])
+        self._launch("notepad")
         logger.info("Notepad opened successfully")
 
     def _open_vscode(self):
-        if os.name == 'nt':  # Windows
-            os.system("code")
-        else:  # Linux/Mac
-            subprocess.Popen(["code"])
+        self._launch("vscode")
         logger.info("VS Code opened successfully")
 
     # System Monitoring Functions
     def _get_system_info(self, **kwargs):
         """Get detailed system information"""
         try:
-            info = {
-                'system': platform.system(),
-                'release': platform.release(),
-                'version': platform.version(),
-                'machine': platform.machine(),
-                'processor': platform.processor(),
-                'cpu_count': psutil.cpu_count(),
-                'memory_total': f"{psutil.virtual_memory().total / (1024**3):.2f} GB",
-                'disk_total': f"{psutil.disk_usage('/').total / (1024**3):.2f} GB"
-            }
-            return json.dumps(info, indent=2)
+            # Every field is fixed for the life of the process, so serialize them once
+            if self._sysinfo_json is None:
+                self._sysinfo_json = _raw({
+                    **self._static_sys,
+                    'memory_total': f"{psutil.virtual_memory().total * _INV_GIB:.2f} GB",
+                    'disk_total': f"{psutil.disk_usage('/').total * _INV_GIB:.2f} GB"
+                })
+            return self._sysinfo_json
         except Exception as e:
-            logger.error(f"Error getting system info: {e}")
-            return json.dumps({"error": str(e)}, indent=2)
+            logger.error("Error getting system info: {}", e)
+            return _raw({"error": str(e)})
 
     def _get_cpu_usage(self, **kwargs):
         """Get current CPU usage percentage"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
+            # Usage since the previous call, without blocking the request. Back-to-back calls
+            # would measure a near-empty window, so reuse a sample younger than 100 ms.
+            now = time.monotonic()
+            ts, cpu_percent = self._cpu_sample
+            if now - ts >= 0.1:
+                cpu_percent = psutil.cpu_percent(interval=None)
+                self._cpu_sample = (now, cpu_percent)
+            # Only the current frequency changes; min/max could be cached if they are ever exposed
             cpu_freq = psutil.cpu_freq()
             
             info = {
                 'cpu_percent': f"{cpu_percent:.2f}%",
-                'cpu_count': cpu_count,
+                'cpu_count': self._static_sys['cpu_count'],
                 'cpu_freq': f"{cpu_freq.current:.2f} MHz" if cpu_freq else "N/A"
             }
-            return json.dumps(info, indent=2)
+            return _raw(info)
         except Exception as e:
-            logger.error(f"Error getting CPU usage: {e}")
-            return json.dumps({"error": str(e)}, indent=2)
+            logger.error("Error getting CPU usage: {}", e)
+            return _raw({"error": str(e)})
 
     def _get_ram_usage(self, **kwargs):
         """Get current RAM usage percentage"""
         try:
             memory = psutil.virtual_memory()
             info = {
-                'total': f"{memory.total / (1024**3):.2f} GB",
-                'available': f"{memory.available / (1024**3):.2f} GB",
-                'used': f"{memory.used / (1024**3):.2f} GB",
+                'total': f"{memory.total * _INV_GIB:.2f} GB",
+                'available': f"{memory.available * _INV_GIB:.2f} GB",
+                'used': f"{memory.used * _INV_GIB:.2f} GB",
                 'percent': f"{memory.percent:.2f}%"
             }
-            return json.dumps(info, indent=2)
+            return _raw(info)
         except Exception as e:
-            logger.error(f"Error getting RAM usage: {e}")
-            return json.dumps({"error": str(e)}, indent=2)
+            logger.error("Error getting RAM usage: {}", e)
+            return _raw({"error": str(e)})
 
     def _get_disk_usage(self, **kwargs):
         """Get current disk usage percentage"""
         try:
             disk = psutil.disk_usage('/')
             info = {
-                'total': f"{disk.total / (1024**3):.2f} GB",
-                'used': f"{disk.used / (1024**3):.2f} GB",
-                'free': f"{disk.free / (1024**3):.2f} GB",
+                'total': f"{disk.total * _INV_GIB:.2f} GB",
+                'used': f"{disk.used * _INV_GIB:.2f} GB",
+                'free': f"{disk.free * _INV_GIB:.2f} GB",
                 'percent': f"{disk.percent:.2f}%"
             }
-            return json.dumps(info, indent=2)
+            return _raw(info)
         except Exception as e:
-            logger.error(f"Error getting disk usage: {e}")
-            return json.dumps({"error": str(e)}, indent=2)
+            logger.error("Error getting disk usage: {}", e)
+            return _raw({"error": str(e)})
 
     def _get_network_info(self, **kwargs):
         """Get network interface information"""
         try:
-            interfaces = {}
-            for iface, addrs in psutil.net_if_addrs().items():
-                interfaces[iface] = []
-                for addr in addrs:
-                    interfaces[iface].append({
-                        'address': addr.address,
-                        'netmask': addr.netmask,
-                        'family': str(addr.family)
-                    })
-            return json.dumps(interfaces, indent=2)
+            now = time.monotonic()
+            ts, cached = self._net_cache
+            if cached is not None and now - ts < 5.0:
+                return cached
+
+            # Each address is an (address, netmask, family) row rather than a dict of its own
+            interfaces = {
+                iface: [(addr.address, addr.netmask, _FAMILY_NAMES.get(addr.family, "UNKNOWN")) for addr in addrs]
+                for iface, addrs in psutil.net_if_addrs().items()
+            }
+            result = _RawJSON(_dumps(interfaces))
+            self._net_cache = (now, result)
+            return result
         except Exception as e:
-            logger.error(f"Error getting network info: {e}")
-            return json.dumps({"error": str(e)}, indent=2)
+            logger.error("Error getting network info: {}", e)
+            return _raw({"error": str(e)})
 
     # File System Functions
-    def _list_directory(self, path: str = "."):
+    def _list_directory(self, path: str = ".", limit: Optional[int] = None):
+        """List entry names in a directory, stopping after limit entries if given"""
         try:
-            return os.listdir(path)
+            with os.scandir(path) as entries:
+                names = [entry.name for entry in islice(entries, limit)]
+            return _RawJSON(_dumps(names))
         except Exception as e:
-            logger.error(f"Error listing directory: {e}")
+            logger.error("Error listing directory: {}", e)
             raise
 
     def _create_directory(self, path: str = None):
@@ -407,76 +559,184 @@ class FunctionRegistry:
             if path is None:
                 path = "test_folder"
             os.makedirs(path, exist_ok=True)
-            logger.info(f"Directory created successfully: {path}")
+            logger.info("Directory created successfully: {}", path)
             return f"Directory '{path}' created successfully"
         except Exception as e:
-            logger.error(f"Error creating directory: {e}")
+            logger.error("Error creating directory: {}", e)
             raise
 
     def _delete_file(self, path: str):
         try:
-            os.remove(path)
-            logger.info(f"File deleted successfully: {path}")
+            os.unlink(path)
+            logger.info("File deleted successfully: {}", path)
             return True
         except Exception as e:
-            logger.error(f"Error deleting file: {e}")
+            logger.error("Error deleting file: {}", e)
+            raise
+
+    def _delete_files(self, paths: Iterable[str]):
+        """
+        Delete several files, opening each containing directory once and unlinking
+        relative to it, so the directory path is resolved once rather than per file.
+        """
+        try:
+            paths = list(paths)
+            if os.unlink not in os.supports_dir_fd:
+                for path in paths:
+                    os.unlink(path)
+            else:
+                for directory, group in groupby(sorted(paths, key=os.path.dirname), key=os.path.dirname):
+                    dir_fd = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+                    try:
+                        for path in group:
+                            os.unlink(os.path.basename(path), dir_fd=dir_fd)
+                    finally:
+                        os.close(dir_fd)
+            logger.info("Deleted {} files", len(paths))
+            return True
+        except Exception as e:
+            logger.error("Error deleting files: {}", e)
             raise
 
     # Command Execution Functions
-    def _run_command(self, command: str):
+    def _run_command(self, command: str, shell: bool = False):
+        """
+        Run a command and return its output.
+        Commands are split and executed directly; pass shell=True for pipes or redirection.
+        """
         try:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True)
+            if shell:
+                result = subprocess.run(command, shell=True, capture_output=True, text=True)
+            else:
+                argv = shlex.split(command, posix=os.name != 'nt')
+                # An absolute executable path lets subprocess use posix_spawn
+                result = subprocess.run(
+                    argv,
+                    executable=shutil.which(argv[0]) or argv[0],
+                    capture_output=True,
+                    text=True,
+                    close_fds=False
+                )
             return result.stdout
         except Exception as e:
-            logger.error(f"Error running command: {e}")
+            logger.error("Error running command: {}", e)
             raise
 
     def _get_process_list(self):
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-            try:
-                processes.append(proc.info)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        return json.dumps(processes, indent=2)
+        """List processes as columns, one array per attribute"""
+        pids, names, cpu, mem = [], [], [], []
+        # attrs fills proc.info through as_dict(), which already reads each process under oneshot();
+        # ad_value makes psutil fill in None for attributes it may not read
+        for proc in psutil.process_iter(attrs=['pid', 'name', 'cpu_percent', 'memory_percent'], ad_value=None):
+            info = proc.info
+            pids.append(info['pid'])
+            names.append(info['name'])
+            cpu.append(info['cpu_percent'])
+            mem.append(info['memory_percent'])
+        return _RawJSON(_dumps({
+            'pid': pids,
+            'name': names,
+            'cpu_percent': cpu,
+            'memory_percent': mem
+        }))
 
     # Time and Date Functions
+    def _local_tzname(self) -> str:
+        """Get the local timezone name, re-reading it at most once an hour"""
+        hour = int(time.time() // 3600)
+        if hour != self._tz_hour:
+            self._tzname = datetime.now().astimezone().tzinfo.tzname(None)
+            self._tz_hour = hour
+        return self._tzname
+
     def _get_current_time(self):
         """Get current system time"""
         try:
-            now = datetime.now()
+            now = time.localtime()
             info = {
-                'time': now.strftime('%H:%M:%S'),
-                'timezone': now.astimezone().tzinfo.tzname(None)
+                'time': time.strftime('%H:%M:%S', now),
+                'timezone': self._local_tzname()
             }
-            return json.dumps(info, indent=2)
+            return _raw(info)
         except Exception as e:
-            logger.error(f"Error getting current time: {e}")
+            logger.error("Error getting current time: {}", e)
             raise
 
     def _get_current_date(self):
         """Get current system date"""
         try:
-            now = datetime.now()
+            now = time.localtime()
             info = {
-                'date': now.strftime('%Y-%m-%d'),
-                'day_of_week': now.strftime('%A'),
-                'timezone': now.astimezone().tzinfo.tzname(None)
+                'date': time.strftime('%Y-%m-%d', now),
+                'day_of_week': time.strftime('%A', now),
+                'timezone': self._local_tzname()
             }
-            return json.dumps(info, indent=2)
+            return _raw(info)
         except Exception as e:
-            logger.error(f"Error getting current date: {e}")
+            logger.error("Error getting current date: {}", e)
             raise
 
     def get_function(self, name: str) -> Callable:
         return self.functions.get(name)
 
+    def get_entry(self, name: str) -> Optional[DispatchEntry]:
+        return self._dispatch.get(name)
+
     def get_metadata(self, name: str) -> FunctionMetadata:
         return self.metadata.get(name)
 
     def get_all_metadata(self) -> Dict[str, FunctionMetadata]:
         return self.metadata
 
+    def get_match_terms(self, name: str) -> MatchTerms:
+        return self._match_terms[name]
+
+    def match_example(self, query_lower: str) -> Optional[str]:
+        """
+        Find a function by its example prompts: the one with an example equal to the
+        query, else the one with the longest example contained in it, else None.
+        """
+        if self._example_index is None:
+            self._example_index = self._build_example_index()
+        exact, pattern = self._example_index
+
+        name = exact.get(query_lower)
+        if name is not None or pattern is None:
+            return name
+
+        # The lookahead yields the longest example starting at every position, overlaps included
+        found = [m.group(1) for m in pattern.finditer(query_lower)]
+        return exact[max(found, key=len)] if found else None
+
+    def _build_example_index(self) -> Tuple[Dict[str, str], Optional[Pattern[str]]]:
+        """Map every lowercased example to its function and compile one pattern over all of them"""
+        exact: Dict[str, str] = {}
+        for name, terms in self._match_terms.items():
+            for example in terms.examples:
+                exact.setdefault(example, name)
+        if not exact:
+            return exact, None
+        alternation = "|".join(re.escape(example) for example in sorted(exact, key=len, reverse=True))
+        return exact, re.compile(f"(?=({alternation}))")
+
+    def has_custom_functions(self) -> bool:
+        """Whether any function was registered besides the built-ins"""
+        return len(self.functions) > self._builtin_count
+
+    def name_word_owners(self) -> Dict[str, FrozenSet[str]]:
+        """Map every word of the function names to the functions whose name contains it"""
+        if self._name_words is None:
+            owners: Dict[str, Set[str]] = {}
+            for name, terms in self._match_terms.items():
+                for word in terms.name_phrase.split():
+                    owners.setdefault(word, set()).add(name)
+            self._name_words = {word: frozenset(names) for word, names in owners.items()}
+        return self._name_words
+
+    def get_documents(self) -> Dict[str, Tuple[str, Dict[str, str]]]:
+        """Vector store (document, metadata) pairs for every registered function"""
+        return self._doc_cache
+
     def register_custom_function(
         self,
         name: str,
@@ -509,64 +769,34 @@ class FunctionRegistry:
                 description=description,
                 category=category,
                 parameters=parameters,
-                examples=examples
+                examples=examples,
+                validate=True
             )
             
-            # Update vector store with new function
-            self._update_vector_store()
-            
-            logger.info(f"Successfully registered custom function: {name}")
+            logger.info("Successfully registered custom function: {}", name)
             return True
             
         except Exception as e:
-            logger.error(f"Error registering custom function: {e}")
+            logger.error("Error registering custom function: {}", e)
             raise
 
-    def _update_vector_store(self):
-        """Update the vector store with all registered functions"""
-        try:
-            # Get all function metadata
-            metadata = self.get_all_metadata()
-            
-            # Prepare documents for embedding
-            documents = []
-            metadatas = []
-            ids = []
-            
-            for func_name, func_metadata in metadata.items():
-                # Create a rich text description combining all metadata
-                doc = f"""
-                Function: {func_metadata.name}
-                Description: {func_metadata.description}
-                Category: {func_metadata.category}
-                Examples: {', '.join(func_metadata.examples or [])}
-                Parameters: {', '.join(func_metadata.parameters.keys()) if func_metadata.parameters else 'None'}
-                """
-                
-                documents.append(doc)
-                
-                # Format metadata as strings to comply with ChromaDB requirements
-                metadatas.append({
-                    "name": str(func_metadata.name),
-                    "category": str(func_metadata.category),
-                    "description": str(func_metadata.description),
-                    "parameters": str(func_metadata.parameters.keys()) if func_metadata.parameters else "None",
-                    "examples": str(func_metadata.examples) if func_metadata.examples else "None"
-                })
-                ids.append(func_name)
+# Singleton instance, created on first access
+_fr: Optional[FunctionRegistry] = None
+_fr_lock = threading.Lock()
 
-            # Update the collection
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
-            
-            logger.info("Successfully updated vector store")
-            
-        except Exception as e:
-            logger.error(f"Error updating vector store: {e}")
-            raise
+def get_function_registry() -> FunctionRegistry:
+    """
+    The shared registry, built on first call. Callers resolve it when they need it,
+    so importing this module or its importers does not register the built-ins.
+    """
+    global _fr
+    if _fr is None:
+        with _fr_lock:
+            if _fr is None:
+                _fr = FunctionRegistry()
+    return _fr
 
-# Create a singleton instance
-function_registry = FunctionRegistry() 
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    if name == "function_registry":
+        return get_function_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
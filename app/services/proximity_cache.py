@@ -0,0 +1,84 @@
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+import threading
+import numpy as np
+
+
+@dataclass
+class ProximityCache:
+    """
+    Approximate key-value cache keyed on query embeddings.
+
+    A lookup hits when the cosine similarity between the query embedding and
+    a cached key is at least ``1 - tau``. When the cache is full, the least
+    recently used entry is evicted.
+    """
+    tau: float
+    capacity: int
+    keys: Optional[np.ndarray] = None
+    values: List[Any] = field(default_factory=list)
+    last_used: List[int] = field(default_factory=list)
+    _clock: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        embedding = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def get(self, embedding: np.ndarray) -> Any:
+        """Return the cached value closest to the embedding, or None on a miss"""
+        q = self._normalize(embedding)
+        with self._lock:
+            if not self.values:
+                return None
+
+            similarities = self.keys[:len(self.values)] @ q
+            idx = int(similarities.argmax())
+            if similarities[idx] < 1 - self.tau:
+                return None
+
+            self._clock += 1
+            self.last_used[idx] = self._clock
+            return self.values[idx]
+
+    def put(self, embedding: np.ndarray, value: Any):
+        """
+        Insert a value, replacing the entry a lookup of the embedding would hit, else
+        evicting the least recently used entry if full
+        """
+        if self.capacity <= 0:
+            return
+
+        q = self._normalize(embedding)
+        with self._lock:
+            self._clock += 1
+
+            if self.keys is None:
+                self.keys = np.empty((self.capacity, q.shape[0]), dtype=np.float32)
+
+            # Replace a near-duplicate entry, which would otherwise keep shadowing the new value
+            similarities = self.keys[:len(self.values)] @ q
+            if len(self.values) and similarities.max() >= 1 - self.tau:
+                idx = int(similarities.argmax())
+                self.values[idx] = value
+                self.last_used[idx] = self._clock
+            elif len(self.values) < self.capacity:
+                idx = len(self.values)
+                self.values.append(value)
+                self.last_used.append(self._clock)
+            else:
+                idx = int(np.argmin(self.last_used))
+                self.values[idx] = value
+                self.last_used[idx] = self._clock
+
+            self.keys[idx] = q
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self.keys = None
+            self.values.clear()
+            self.last_used.clear()
+            self._clock = 0
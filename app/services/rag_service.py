@@ -1,80 +1,376 @@
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Optional, Callable, Pattern, FrozenSet, BinaryIO
 import os
+import threading
+import hashlib
+import sys
+import orjson
+import numpy as np
+import torch
+from functools import lru_cache
+from collections import deque
+from operator import itemgetter
 from app.core.config import settings
-from app.services.function_registry import function_registry
+from app.services.function_registry import DispatchEntry, get_function_registry
+from app.models.schemas import FunctionMetadata
+from app.services.proximity_cache import ProximityCache
 from loguru import logger
 from datetime import datetime
+import re
+
+# Words that name a built-in function unambiguously. A prompt is dispatched on them without
+# retrieval only when it is short and points at exactly one function (see _dispatch_keyword).
+_KEYWORD_DISPATCH: Dict[str, str] = {
+    "chrome": "open_chrome",
+    "browser": "open_chrome",
+    "calculator": "open_calculator",
+    "calc": "open_calculator",
+    "notepad": "open_notepad",
+    "cpu": "get_cpu_usage",
+    "ram": "get_ram_usage",
+    "memory": "get_ram_usage",
+    "disk": "get_disk_usage",
+    "storage": "get_disk_usage",
+    "network": "get_network_info",
+    "time": "get_current_time",
+    "date": "get_current_date",
+}
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Longer prompts likely say more than the keyword, so they go through retrieval
+_DISPATCH_MAX_WORDS = 6
+
+# HNSW settings for the Chroma collection, used once the registry outgrows in-memory search.
+# The space stays l2: it ranks unit vectors like cosine and matches the distances _search reports.
+# ef_search can be retuned on an existing collection with collection.modify(configuration=...).
+_HNSW_CONFIG = {"hnsw": {"space": "l2", "ef_construction": 200, "ef_search": 64, "max_neighbors": 16}}
+
+# Prompt words that boost every function in a category during ranking
+_CATEGORY_WORDS: Dict[str, Tuple[str, ...]] = {
+    "System Monitoring": ("show", "get", "check", "display", "monitor", "system"),
+    "Application Control": ("open", "launch", "start", "run", "execute"),
+}
+
+@lru_cache(maxsize=256)
+def _parameter_pattern(names: Tuple[str, ...]) -> Tuple[Pattern, Dict[str, str]]:
+    """
+    Compile one case-insensitive pattern matching any parameter name followed by its value,
+    along with a map from the lowercased matched name back to the parameter name
+    """
+    alternatives = "|".join(map(re.escape, names))
+    pattern = re.compile(rf"\b({alternatives})\b\s*[:=]?\s*(\S+)", re.IGNORECASE)
+    return pattern, {name.lower(): name for name in names}
+
+# Loaded embedding models, keyed on the settings that shape them; the Chroma client
+# needs no such cache since chromadb already shares one system per path
+_MODEL_CACHE: Dict[Tuple, SentenceTransformer] = {}
+_MODEL_LOCK = threading.Lock()
 
 class RAGService:
     def __init__(self):
-        self.client = chromadb.Client(Settings(
-            persist_directory=settings.CHROMA_DB_PATH,
-            anonymized_telemetry=False
-        ))
-        self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
-        self.collection = self.client.get_or_create_collection("function_metadata")
-        self.session_history = []  # Store chat history
-        self._initialize_vector_store()
+        self.client = chromadb.PersistentClient(
+            path=settings.CHROMA_DB_PATH,
+            settings=Settings(anonymized_telemetry=False)
+        )
+        self.model = self._shared_model()
+        self._cached_embed = lru_cache(maxsize=settings.EMBEDDING_CACHE_SIZE)(self._encode)
+        self._cached_retrieve = lru_cache(maxsize=settings.RETRIEVAL_CACHE_SIZE)(self._retrieve)
+        self.collection = self.client.get_or_create_collection("function_metadata", configuration=_HNSW_CONFIG)
+        self.session_history = deque(maxlen=10)  # Store chat history, keeping only the last 10 interactions
+        self.match_cache = ProximityCache(
+            tau=settings.PROXIMITY_TAU,
+            capacity=settings.PROXIMITY_CAPACITY
+        )
+        # Nearest functions for paraphrased queries, keyed on the query embedding. Only the search
+        # output is reused: the scores depend on the exact wording and history, so they are recomputed
+        self.retrieval_cache = ProximityCache(
+            tau=settings.RETRIEVAL_PROXIMITY_TAU,
+            capacity=settings.RETRIEVAL_CACHE_SIZE
+        )
+        # In-memory copy of the vector store used for exact search
+        self._ids: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        # Embeddings quantized to int8 rows plus a float scale per row, published together
+        self._index: Tuple[np.ndarray, np.ndarray] = self._empty_index()
+        # Content hash of every embedded document, persisted next to the Chroma DB
+        self._hash_path = os.path.join(settings.CHROMA_DB_PATH, "function_hashes.json")
+        self._doc_hashes: Dict[str, str] = {}
+        # Quantized index saved next to the hashes, memory-mapped on the next start
+        self._index_paths = tuple(
+            os.path.join(settings.CHROMA_DB_PATH, f"function_index_{part}.npy") for part in ("rows", "scales")
+        )
+        self._warm = False
+        self._warmup_lock = threading.Lock()
+
+    @staticmethod
+    def _shared_model() -> SentenceTransformer:
+        """Load the embedding model once per process and configuration, shared by every RAGService"""
+        key = (
+            settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND, settings.EMBEDDING_ONNX_FILE,
+            settings.EMBEDDING_ONNX_PROVIDER, settings.QUANTIZE_EMBEDDING
+        )
+        with _MODEL_LOCK:
+            model = _MODEL_CACHE.get(key)
+            if model is None:
+                model = _MODEL_CACHE[key] = RAGService._load_model()
+            return model
+
+    @staticmethod
+    def _load_model() -> SentenceTransformer:
+        """Load the embedding model on the configured inference backend"""
+        # Cap the thread pools only when asked to, e.g. by the launcher splitting the cores between
+        # worker processes; a single process keeps the runtimes' defaults
+        threads = settings.EMBEDDING_THREADS
+        if threads:
+            torch.set_num_threads(threads)
+            try:
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                # Only settable once per process, before any inter-op parallel work has run
+                pass
+
+        if settings.EMBEDDING_BACKEND == "onnx":
+            # Name the provider: sentence-transformers otherwise takes the first available one,
+            # which is AzureExecutionProvider on the stock onnxruntime wheels
+            model_kwargs = {"provider": settings.EMBEDDING_ONNX_PROVIDER}
+            if threads:
+                import onnxruntime
+
+                session_options = onnxruntime.SessionOptions()
+                session_options.intra_op_num_threads = threads
+                session_options.inter_op_num_threads = 1
+                model_kwargs["session_options"] = session_options
+            if settings.EMBEDDING_ONNX_FILE:
+                model_kwargs["file_name"] = settings.EMBEDDING_ONNX_FILE
+            return SentenceTransformer(settings.EMBEDDING_MODEL, backend="onnx", model_kwargs=model_kwargs)
+
+        model = SentenceTransformer(settings.EMBEDDING_MODEL, backend=settings.EMBEDDING_BACKEND)
+        if settings.EMBEDDING_BACKEND == "torch" and model.device.type == "cuda":
+            # Half precision roughly doubles GPU throughput for a negligible accuracy cost
+            model.half()
+        elif settings.EMBEDDING_BACKEND == "torch" and settings.QUANTIZE_EMBEDDING:
+            # Run every Linear layer as an int8 GEMM on CPU; auto_model is read-only, so swap in place
+            torch.ao.quantization.quantize_dynamic(
+                model[0].auto_model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+        return model
+
+    def warmup(self):
+        """Embed all registered functions and load them into the vector store, once"""
+        with self._warmup_lock:
+            if not self._warm:
+                self._initialize_vector_store()
+                self._warm = True
+
+    def sync_functions(self) -> int:
+        """
+        Embed and store functions registered since the last sync.
+        Before warmup this is a no-op, since warmup embeds every function.
+        """
+        with self._warmup_lock:
+            if not self._warm:
+                return 0
+            return self._add_functions()
 
     def _initialize_vector_store(self):
         """Initialize the vector store with function metadata"""
         try:
-            # First, delete the existing collection if it exists
-            try:
-                self.client.delete_collection("function_metadata")
-                logger.info("Deleted existing collection")
-            except:
-                pass
-            
-            # Create a new collection
-            self.collection = self.client.create_collection("function_metadata")
-            
-            # Get all function metadata
-            metadata = function_registry.get_all_metadata()
-            
-            # Prepare documents for embedding
-            documents = []
-            metadatas = []
-            ids = []
-            
-            for func_name, func_metadata in metadata.items():
-                # Create a rich text description combining all metadata
-                doc = f"""
-                Function: {func_metadata.name}
-                Description: {func_metadata.description}
-                Category: {func_metadata.category}
-                Examples: {', '.join(func_metadata.examples or [])}
-                Parameters: {', '.join(func_metadata.parameters.keys()) if func_metadata.parameters else 'None'}
-                """
-                
-                documents.append(doc)
-                
-                # Format metadata as strings to comply with ChromaDB requirements
-                metadatas.append({
-                    "name": str(func_metadata.name),
-                    "category": str(func_metadata.category),
-                    "description": str(func_metadata.description),
-                    "parameters": str(func_metadata.parameters.keys()) if func_metadata.parameters else "None",
-                    "examples": str(func_metadata.examples) if func_metadata.examples else "None"
-                })
-                ids.append(func_name)
-
-            # Add documents to the collection
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
+            self.collection = self.client.get_or_create_collection("function_metadata", configuration=_HNSW_CONFIG)
+            self._ids = []
+            self._metadatas = []
+            self._index = self._empty_index()
+            self._doc_hashes = {}
+
+            documents = get_function_registry().get_documents()
+            current = {name: self._doc_hash(doc, metadata) for name, (doc, metadata) in documents.items()}
+
+            # Fast path: the collection was last synced with exactly this registry
+            if (self.collection.metadata or {}).get("fingerprint") == self._fingerprint(current):
+                if not self._map_index(documents, current):
+                    self._load_stored(list(current), current)
+                if len(self._ids) == len(current):
+                    logger.info("Vector store is up to date with {} functions", len(self._ids))
+                    return
+                self._ids, self._metadatas, self._index = [], [], self._empty_index()
+                self._doc_hashes = {}
+
+            # Drop stored functions that are no longer registered
+            previous = self._load_hashes()
+            stale = [name for name in previous if name not in documents]
+            if stale:
+                self.collection.delete(ids=stale)
+
+            # Reuse stored embeddings for documents whose content has not changed
+            unchanged = [name for name, digest in current.items() if previous.get(name) == digest]
+            if unchanged:
+                self._load_stored(unchanged, current)
+
+            count = self._add_functions()
+            if not count:
+                # Nothing new was embedded, but stale entries may have been dropped
+                self._save_hashes()
+            logger.info(
+                "Successfully initialized vector store: {} functions reused, {} embedded",
+                len(self._ids) - count, count
             )
             
-            logger.info(f"Successfully initialized vector store with {len(documents)} functions")
-            
         except Exception as e:
-            logger.error(f"Error initializing vector store: {e}")
+            logger.error("Error initializing vector store: {}", e)
             raise
 
+    def _load_stored(self, ids: List[str], hashes: Dict[str, str]):
+        """Load stored embeddings for the given functions into the in-memory index"""
+        stored = self.collection.get(ids=ids, include=["embeddings", "metadatas"])
+        if not len(stored["ids"]):
+            return
+        # Intern ids read back from Chroma so they are the registry's own name objects
+        self._ids = [sys.intern(name) for name in stored["ids"]]
+        self._metadatas = list(stored["metadatas"])
+        rows, scales = self._quantize(np.asarray(stored["embeddings"], dtype=np.float32))
+        self._index = self._freeze(rows), self._freeze(scales)
+        self._doc_hashes = {name: hashes[name] for name in self._ids}
+
+    def _map_index(self, documents: Dict[str, Tuple[str, Dict[str, str]]], hashes: Dict[str, str]) -> bool:
+        """
+        Memory-map the index saved by the previous run if it was built from the given hashes.
+        The OS page cache then holds the rows, shared by every worker process.
+        """
+        # The saved hashes are in row order
+        saved = self._load_hashes()
+        if saved != hashes:
+            return False
+        try:
+            rows, scales = (np.load(path, mmap_mode="r") for path in self._index_paths)
+        except (OSError, ValueError):
+            return False
+        if len(rows) != len(saved) or len(scales) != len(saved):
+            return False
+
+        self._ids = [sys.intern(name) for name in saved]
+        self._metadatas = [documents[name][1] for name in self._ids]
+        self._index = rows, scales
+        self._doc_hashes = saved
+        return True
+
+    def _add_functions(self) -> int:
+        """Embed registered functions missing from the vector store and add them"""
+        documents = get_function_registry().get_documents()
+        # _doc_hashes is keyed by every stored id, so it doubles as the membership set
+        new_ids = [name for name in documents if name not in self._doc_hashes]
+        if not new_ids:
+            return 0
+
+        docs = [documents[name][0] for name in new_ids]
+        metadatas = [documents[name][1] for name in new_ids]
+
+        # Embed the new documents in a single batched call; encode() already sorts
+        # inputs by length so each batch pads to its own longest document
+        embeddings = self.model.encode(
+            docs,
+            batch_size=64,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+
+        self.collection.upsert(
+            embeddings=embeddings,
+            documents=docs,
+            metadatas=metadatas,
+            ids=new_ids
+        )
+
+        # Extend the quantized copy used for in-memory search. Searches read the
+        # index before the ids, so publish the ids first to keep every row addressable.
+        self._ids = self._ids + new_ids
+        self._metadatas = self._metadatas + metadatas
+        rows, scales = self._quantize(embeddings)
+        old_rows, old_scales = self._index
+        if old_rows.size:
+            rows = np.vstack((old_rows, rows))
+            scales = np.concatenate((old_scales, scales))
+        self._index = self._freeze(rows), self._freeze(scales)
+
+        for name, doc, metadata in zip(new_ids, docs, metadatas):
+            self._doc_hashes[name] = self._doc_hash(doc, metadata)
+        self._save_hashes()
+
+        # Cached rankings and matches may now have a better candidate
+        self._cached_retrieve.cache_clear()
+        self.match_cache.clear()
+        self.retrieval_cache.clear()
+        return len(new_ids)
+
+    @staticmethod
+    def _empty_index() -> Tuple[np.ndarray, np.ndarray]:
+        return np.empty((0, 0), dtype=np.int8), np.empty(0, dtype=np.float32)
+
+    @staticmethod
+    def _quantize(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Quantize embedding rows to int8 with a symmetric per-row scale"""
+        scales = np.abs(matrix).max(axis=1).astype(np.float32) / 127
+        scales[scales == 0] = 1
+        rows = np.round(matrix / scales[:, None]).astype(np.int8)
+        return rows, scales
+
+    @staticmethod
+    def _freeze(matrix: np.ndarray) -> np.ndarray:
+        """
+        Make a search matrix C-contiguous and read-only. It is only ever replaced, never
+        written in place, so searches can read it without copying.
+        """
+        matrix = np.ascontiguousarray(matrix)
+        matrix.flags.writeable = False
+        return matrix
+
+    @staticmethod
+    def _doc_hash(doc: str, metadata: Dict[str, str]) -> str:
+        """Hash a function document together with the model that embeds it"""
+        model = (
+            settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND,
+            settings.EMBEDDING_ONNX_FILE, settings.QUANTIZE_EMBEDDING
+        )
+        payload = orjson.dumps((model, doc, metadata), option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _load_hashes(self) -> Dict[str, str]:
+        """Read the document hashes saved by the previous run"""
+        try:
+            with open(self._hash_path, "rb") as f:
+                return orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+
+    def _save_hashes(self):
+        """
+        Persist the index and document hashes alongside the Chroma DB, and their fingerprint on the collection.
+        The index goes first, so saved hashes never describe rows that were not written.
+        """
+        os.makedirs(os.path.dirname(self._hash_path), exist_ok=True)
+        for path, matrix in zip(self._index_paths, self._index):
+            self._replace_file(path, lambda f: np.save(f, matrix))
+        self._replace_file(self._hash_path, lambda f: f.write(orjson.dumps(self._doc_hashes)))
+        self.collection.modify(metadata={"fingerprint": self._fingerprint(self._doc_hashes)})
+
+    @staticmethod
+    def _replace_file(path: str, write: Callable[[BinaryIO], Any]):
+        """
+        Write a new file and rename it over the old one, so readers never see a partial file
+        and running workers keep the old one mapped
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _fingerprint(hashes: Dict[str, str]) -> str:
+        """Fingerprint a whole set of document hashes"""
+        return hashlib.blake2b(orjson.dumps(hashes, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
     def add_to_history(self, prompt: str, function_name: str, result: str):
         """Add interaction to session history"""
         self.session_history.append({
@@ -83,21 +379,11 @@ class RAGService:
             "result": result,
             "timestamp": datetime.now().isoformat()
         })
-        # Keep only last 10 interactions
-        if len(self.session_history) > 10:
-            self.session_history.pop(0)
-
-    def get_relevant_history(self, current_prompt: str) -> str:
-        """Get relevant context from session history"""
-        if not self.session_history:
-            return ""
-
-        # Convert history to text for context
-        history_text = "\n".join([
-            f"Previous interaction: {item['prompt']} -> {item['function']}"
-            for item in self.session_history[-3:]  # Use last 3 interactions
-        ])
-        return f"Previous interactions:\n{history_text}\n\nCurrent prompt: {current_prompt}"
+
+    def _recent_functions(self) -> FrozenSet[str]:
+        """Functions used in recent interactions, which get a small ranking boost"""
+        # Copying the deque is atomic, so concurrent appends cannot break the iteration
+        return frozenset(item["function"] for item in list(self.session_history))
 
     def retrieve_functions(self, query: str, n_results: int = None) -> List[Dict[str, Any]]:
         """
@@ -107,102 +393,219 @@ class RAGService:
             if n_results is None:
                 n_results = settings.MAX_RETRIEVAL_RESULTS
 
-            # Get relevant context from history
-            context = self.get_relevant_history(query)
+            if not self._warm:
+                self.warmup()
 
-            # Query the vector store with context
-            results = self.collection.query(
-                query_texts=[context],
-                n_results=n_results
-            )
+            query = query.strip()
 
-            # Process results
-            retrieved_functions = []
-            query_lower = query.lower()
-            
-            for i in range(len(results['ids'][0])):
-                func_name = results['ids'][0][i]
-                metadata = results['metadatas'][0][i]
-                distance = results['distances'][0][i]
-                
-                # Get function metadata for additional context
-                func_metadata = function_registry.get_metadata(func_name)
-                
-                # Calculate base relevance score
-                relevance_score = 1 - distance
-                
-                # Check for exact matches in examples
-                if any(example.lower() == query_lower for example in func_metadata.examples):
-                    relevance_score = 1.0
-                
-                # Check for partial matches in examples
-                elif any(example.lower() in query_lower for example in func_metadata.examples):
-                    relevance_score += 0.3
-                
-                # Check for function name matches
-                elif func_name.replace('_', ' ').lower() in query_lower:
-                    relevance_score += 0.2
-                
-                # Check for description matches
-                elif func_metadata.description.lower() in query_lower:
-                    relevance_score += 0.1
-                
-                # Category-specific boosts
-                if func_metadata.category == "System Monitoring" and any(word in query_lower for word in ["show", "get", "check", "display", "monitor", "system"]):
-                    relevance_score += 0.5
-                
-                elif func_metadata.category == "Application Control" and any(word in query_lower for word in ["open", "launch", "start", "run", "execute"]):
-                    relevance_score += 0.5
-                
-                retrieved_functions.append({
-                    "name": func_name,
-                    "metadata": metadata,
-                    "relevance_score": relevance_score,
-                    "category": func_metadata.category,
-                    "description": func_metadata.description,
-                    "parameters": func_metadata.parameters,
-                    "examples": func_metadata.examples
-                })
-
-            # Sort by relevance score
-            retrieved_functions.sort(key=lambda x: x["relevance_score"], reverse=True)
-            
-            logger.info(f"Retrieved {len(retrieved_functions)} functions for query: {query}")
+            # Repeated prompts with the same recent functions reuse the cached ranking
+            retrieved_functions = list(self._cached_retrieve(query, self._recent_functions(), n_results))
+            logger.info("Retrieved {} functions for query: {}", len(retrieved_functions), query)
             return retrieved_functions
 
         except Exception as e:
-            logger.error(f"Error retrieving functions: {e}")
+            logger.error("Error retrieving functions: {}", e)
             raise
 
-    def get_best_match(self, query: str) -> Dict[str, Any]:
+    def _retrieve(self, query: str, recent: FrozenSet[str], n_results: int) -> Tuple[Dict[str, Any], ...]:
+        """Rank functions for a query and the recently used functions, memoized on both"""
+        query_lower = query.lower()
+
+        # Search the vector store with the query alone; history only reranks the results
+        embedding = self.embed(query)
+
+        # A near-identical query has the same nearest functions
+        cached = self.retrieval_cache.get(embedding)
+        if cached is not None and cached[0] == n_results:
+            ids, metadatas, distances = cached[1]
+        else:
+            ids, metadatas, distances = self._search(embedding, n_results)
+            self.retrieval_cache.put(embedding, (n_results, (ids, metadatas, distances)))
+
+        # Category boosts depend only on the query, so decide them once for all results
+        category_boost = {
+            category: 0.5
+            for category, words in _CATEGORY_WORDS.items()
+            if any(word in query_lower for word in words)
+        }
+
+        # Process results
+        retrieved_functions = []
+        registry = get_function_registry()
+        
+        for func_name, metadata, distance in zip(ids, metadatas, distances):
+            # Get function metadata for additional context
+            func_metadata = registry.get_metadata(func_name)
+            terms = registry.get_match_terms(func_name)
+            
+            # Calculate base relevance score
+            relevance_score = 1 - distance
+            
+            # Check for exact matches in examples
+            if query_lower in terms.examples:
+                relevance_score = 1.0
+            
+            # Check for partial matches in examples
+            elif any(example in query_lower for example in terms.examples):
+                relevance_score += 0.3
+            
+            # Check for function name matches
+            elif terms.name_phrase in query_lower:
+                relevance_score += 0.2
+            
+            # Check for description matches
+            elif terms.description in query_lower:
+                relevance_score += 0.1
+            
+            # Category-specific boosts
+            relevance_score += category_boost.get(func_metadata.category, 0.0)
+
+            # Session history boost
+            if func_name in recent:
+                relevance_score += settings.HISTORY_BOOST
+            
+            retrieved_functions.append({
+                "name": func_name,
+                "metadata": metadata,
+                "relevance_score": relevance_score,
+                "category": func_metadata.category,
+                "description": func_metadata.description,
+                "parameters": func_metadata.parameters,
+                "examples": func_metadata.examples
+            })
+
+        # Sort by relevance score
+        retrieved_functions.sort(key=itemgetter("relevance_score"), reverse=True)
+        return tuple(retrieved_functions)
+
+    def _search(self, embedding: np.ndarray, n_results: int) -> Tuple[List[str], List[Dict[str, Any]], List[float]]:
         """
-        Get the best matching function for a given query
+        Find the nearest functions to a query embedding.
+        Small registries are scored with a single in-memory matmul; larger ones use Chroma.
+        """
+        if len(self._ids) > settings.EXACT_SEARCH_MAX_FUNCTIONS:
+            results = self.collection.query(
+                query_embeddings=[embedding],
+                n_results=n_results
+            )
+            return results['ids'][0], results['metadatas'][0], results['distances'][0]
+
+        rows, scales = self._index
+        n_results = min(n_results, len(rows))
+        if n_results <= 0:
+            return [], [], []
+
+        # numpy has no int8 GEMM, but int8 rows against a float32 query still beat a
+        # float16 matmul (which has no BLAS path) and use a quarter of float32's memory
+        similarities = (rows @ embedding) * scales
+        top = np.argpartition(-similarities, n_results - 1)[:n_results]
+        top = top[np.argsort(-similarities[top])]
+        # Squared L2 distance between unit vectors, matching Chroma's default space
+        distances = 2 - 2 * similarities[top].astype(np.float32)
+        return [self._ids[i] for i in top], [self._metadatas[i] for i in top], distances.tolist()
+
+    def _encode(self, text: str) -> np.ndarray:
+        """Run the embedding model on a single piece of text"""
+        embedding = self.model.encode(
+            text, normalize_embeddings=True, convert_to_numpy=True, show_progress_bar=False
+        )
+        # Cached arrays are shared between callers, so keep them read-only
+        embedding.flags.writeable = False
+        return embedding
+
+    def embed(self, text: str) -> np.ndarray:
+        """Get the normalized embedding for a piece of text, memoized on the raw string"""
+        return self._cached_embed(text)
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit and miss counters of the embedding and retrieval caches"""
+        return {
+            name: cache.cache_info()._asdict()
+            for name, cache in (("embed", self._cached_embed), ("retrieve", self._cached_retrieve))
+        }
+
+    def get_best_match(self, query: str) -> Optional[Tuple[str, DispatchEntry, FunctionMetadata]]:
+        """
+        Get the best matching function for a given query as a (name, dispatch entry, metadata)
+        tuple, so callers can invoke it without going back to the registry.
+        Near-duplicate queries with the same recent functions are answered from the proximity cache.
+        """
+        query = query.strip()
+        query_lower = query.lower()
+
+        # Prompts matching a registered example resolve from the example index without embedding
+        name = get_function_registry().match_example(query_lower)
+        if name is not None:
+            return self._resolve(name)
+
+        # Then short prompts naming a single built-in function by keyword
+        name = self._dispatch_keyword(query_lower)
+        if name is not None:
+            return self._resolve(name)
+
+        # The history boost can change the winner, so a cached match only holds for the same history
+        recent = self._recent_functions()
+        embedding = self.embed(query)
+        cached = self.match_cache.get(embedding)
+        if cached is not None and cached[0] == recent:
+            return cached[1]
+
+        match = self._find_best_match(query, query_lower)
+        if match is None:
+            return None
+
+        resolved = self._resolve(match["name"])
+        self.match_cache.put(embedding, (recent, resolved))
+        return resolved
+
+    @staticmethod
+    def _dispatch_keyword(query_lower: str) -> Optional[str]:
+        """
+        The built-in function a prompt names by keyword, or None unless that is unambiguous:
+        no custom functions are registered, the prompt is short, its keywords all point at
+        one function and it uses no word from another function's name that this one lacks.
+        """
+        registry = get_function_registry()
+        if registry.has_custom_functions():
+            return None
+        words = _WORD_RE.findall(query_lower)
+        if len(words) > _DISPATCH_MAX_WORDS:
+            return None
+        names = {_KEYWORD_DISPATCH[word] for word in words if word in _KEYWORD_DISPATCH}
+        if len(names) != 1:
+            return None
+        name = names.pop()
+        if registry.get_function(name) is None:
+            return None
+        owners = registry.name_word_owners()
+        if any(name not in owners[word] for word in words if word in owners):
+            return None
+        return name
+
+    @staticmethod
+    def _resolve(name: str) -> Tuple[str, DispatchEntry, FunctionMetadata]:
+        registry = get_function_registry()
+        return name, registry.get_entry(name), registry.get_metadata(name)
+
+    def _find_best_match(self, query: str, query_lower: str) -> Dict[str, Any]:
+        """
+        Find the best matching function for a given query using the vector store
         """
         results = self.retrieve_functions(query, n_results=5)  # Get top 5 matches
         
         if not results:
             return None
             
-        query_lower = query.lower()
-        
-        # First, try exact matches in examples
-        for result in results:
-            if any(example.lower() == query_lower for example in result["examples"]):
-                return result
-        
-        # Then, try partial matches in examples
-        for result in results:
-            if any(example.lower() in query_lower for example in result["examples"]):
-                return result
+        # Exact and partial example matches were already resolved by the example index
         
         # For system monitoring queries, prefer system info function
-        if any(word in query_lower for word in ["show", "get", "check", "display", "monitor", "system"]):
+        if any(word in query_lower for word in _CATEGORY_WORDS["System Monitoring"]):
             for result in results:
                 if result["name"] == "get_system_info":
                     return result
         
         # For application control queries, prefer specific apps
-        if any(word in query_lower for word in ["open", "launch", "start", "run", "execute"]):
+        if any(word in query_lower for word in _CATEGORY_WORDS["Application Control"]):
             for result in results:
                 if result["category"] == "Application Control":
                     return result
@@ -216,13 +619,8 @@ class RAGService:
         """
         params = {}
         if function_metadata.get("parameters"):
-            # Simple parameter extraction based on keywords
-            for param_name in function_metadata["parameters"]:
-                if param_name in query.lower():
-                    # Extract the value after the parameter name
-                    try:
-                        value = query.split(param_name)[1].split()[0]
-                        params[param_name] = value
-                    except:
-                        pass
+            # Simple parameter extraction based on keywords: the value is the word after the parameter name
+            pattern, names = _parameter_pattern(tuple(function_metadata["parameters"]))
+            for name, value in pattern.findall(query):
+                params.setdefault(names[name.lower()], value)
         return params 
\ No newline at end of file
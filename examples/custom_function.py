@@ -1,6 +1,11 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
+# One session for every call, so requests reuse a kept-alive connection to the API
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_maxsize=10))
+
 def register_custom_function():
     """Example of registering a custom function"""
     
@@ -36,7 +41,7 @@ def fibonacci(n: int) -> int:
     }
     
     # Register the function
-    response = requests.post(
+    response = SESSION.post(
         "http://localhost:8000/api/v1/register-function",
         json=function_data
     )
@@ -59,7 +64,7 @@ def test_custom_function():
     ]
     
     for prompt in prompts:
-        response = requests.post(
+        response = SESSION.post(
             "http://localhost:8000/api/v1/execute",
             json={"prompt": prompt}
         )
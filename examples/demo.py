@@ -1,9 +1,15 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 import time
 from datetime import datetime
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# One session for every call, so requests reuse a kept-alive connection to the API
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_maxsize=10))
 
 def clear_screen():
     """Clear the terminal screen"""
@@ -42,7 +48,7 @@ def print_menu():
 def execute_function(prompt, context=None):
     """Execute a function through the API"""
     try:
-        response = requests.post(
+        response = SESSION.post(
             "http://localhost:8000/api/v1/execute",
             json={"prompt": prompt, "context": context or {}}
         )
@@ -60,13 +66,15 @@ def print_result(result, title):
         print("\nFunction:", result.get("function"))
         print("\nResult:")
         print("-"*30)
-        try:
-            # Try to parse and pretty print JSON
-            data = json.loads(result.get("code"))
-            print(json.dumps(data, indent=2))
-        except:
-            # If not JSON, print as is
-            print(result.get("code"))
+        code = result.get("code")
+        # Only parse payloads that can be JSON objects or arrays; print anything else as is
+        if isinstance(code, str) and code.lstrip()[:1] in ("{", "["):
+            try:
+                print(orjson.dumps(orjson.loads(code), option=orjson.OPT_INDENT_2).decode())
+            except orjson.JSONDecodeError:
+                print(code)
+        else:
+            print(code)
         print("-"*30)
     else:
         print("\nError:", result.get("error", "Unknown error occurred"))
@@ -84,13 +92,15 @@ def run_all_examples():
         ("Opening Chrome", "Open Chrome browser")
     ]
     
-    for title, prompt in examples:
-        clear_screen()
-        print_header()
-        print(f"\nExecuting: {title}")
-        result = execute_function(prompt)
-        print_result(result, title)
-        time.sleep(2)
+    clear_screen()
+    print_header()
+    print(f"\nExecuting {len(examples)} examples...")
+    # Send the prompts concurrently and print each result as it arrives; they all
+    # stay on screen until the menu returns, so there is no need to pause between them
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {executor.submit(execute_function, prompt): title for title, prompt in examples}
+        for future in as_completed(futures):
+            print_result(future.result(), futures[future])
 
 def main():
     while True:
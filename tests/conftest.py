@@ -0,0 +1,12 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+@pytest.fixture(scope="session")
+def client():
+    # Enter the client once so the app lifespan loads the RAG service for the whole session
+    with TestClient(app) as c:
+        # Run one retrieval so the first test does not pay for the first forward pass;
+        # a throwaway /execute could run a function with side effects
+        c.app.state.rag.retrieve_functions("warmup")
+        yield c
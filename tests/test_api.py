@@ -1,9 +1,4 @@
-from fastapi.testclient import TestClient
-from app.main import app
-
-client = TestClient(app)
-
-def test_execute_function():
+def test_execute_function(client):
     # Test opening calculator
     response = client.post(
         "/api/v1/execute",
@@ -0,0 +1,35 @@
+import numpy as np
+from app.services.rag_service import RAGService
+
+def _service_with(embeddings: np.ndarray) -> RAGService:
+    # Skip __init__: the search only needs the in-memory index, not the model or Chroma
+    service = RAGService.__new__(RAGService)
+    service._ids = [f"f{i}" for i in range(len(embeddings))]
+    service._metadatas = [{"name": name} for name in service._ids]
+    rows, scales = RAGService._quantize(embeddings)
+    service._index = RAGService._freeze(rows), RAGService._freeze(scales)
+    return service
+
+def test_exact_search_matches_float_ranking():
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((200, 384)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    query = embeddings[7] + 0.1 * embeddings[42]
+    query /= np.linalg.norm(query)
+
+    ids, metadatas, distances = _service_with(embeddings)._search(query, 5)
+
+    expected = np.argsort(-(embeddings @ query))[:5]
+    assert ids == [f"f{i}" for i in expected]
+    assert [m["name"] for m in metadatas] == ids
+    # Squared L2 distances between unit vectors, nearest first
+    assert distances == sorted(distances)
+    assert abs(distances[0] - (2 - 2 * float(embeddings[7] @ query))) < 0.01
+
+def test_exact_search_caps_results_at_index_size():
+    embeddings = np.eye(3, 8, dtype=np.float32)
+
+    ids, _, _ = _service_with(embeddings)._search(embeddings[1], 10)
+
+    assert len(ids) == 3
+    assert ids[0] == "f1"
@@ -0,0 +1,24 @@
+from app.services.rag_service import RAGService
+
+def _extract(query, parameters):
+    # Skip __init__: extraction only needs the compiled parameter pattern
+    return RAGService.__new__(RAGService).extract_parameters(query, {"parameters": parameters})
+
+def test_extracts_the_word_after_each_parameter_name():
+    params = _extract("copy source a.txt to destination=b.txt", {"source": "From", "destination": "To"})
+    assert params == {"source": "a.txt", "destination": "b.txt"}
+
+def test_parameter_names_match_case_insensitively():
+    assert _extract("delete FILE_PATH: notes.txt", {"file_path": "Path"}) == {"file_path": "notes.txt"}
+
+def test_first_occurrence_wins():
+    assert _extract("path one.txt or path two.txt", ["path"]) == {"path": "one.txt"}
+
+def test_names_are_matched_as_whole_words_and_literally():
+    # "path" inside "filepath" is not the parameter, and "." in a name is not a wildcard
+    assert _extract("filepath x.txt", ["path"]) == {}
+    assert _extract("set a-b 3", ["a.b"]) == {}
+    assert _extract("set a.b 3", ["a.b"]) == {"a.b": "3"}
+
+def test_no_parameters():
+    assert _extract("show cpu usage", None) == {}
@@ -0,0 +1,74 @@
+import pytest
+import orjson
+from pydantic import ValidationError
+from app.services.function_registry import FunctionRegistry
+
+@pytest.fixture
+def registry():
+    return FunctionRegistry()
+
+def test_invalid_custom_function_leaves_no_trace(registry):
+    with pytest.raises(ValidationError):
+        registry.register_custom_function(name="hello", func=lambda: "hi", description="Say hello", examples=[1, 2])
+
+    assert "hello" not in registry.functions
+    assert "hello" not in registry.get_documents()
+
+    # The name is still free for a valid registration
+    registry.register_custom_function(name="hello", func=lambda: "hi", description="Say hello", examples=["say hello"])
+    assert registry.get_metadata("hello").examples == ["say hello"]
+
+def test_match_example_exact(registry):
+    assert registry.match_example("delete the file") == "delete_file"
+    assert registry.match_example("nothing registered says this") is None
+
+def test_match_example_prefers_longest_contained_example(registry):
+    registry.register_custom_function(name="weather", func=lambda: 1, description="Weather", examples=["show weather"])
+    registry.register_custom_function(name="forecast", func=lambda: 1, description="Forecast", examples=["show weather forecast"])
+
+    assert registry.match_example("please show weather forecast now") == "forecast"
+    assert registry.match_example("show weather today") == "weather"
+
+def test_match_example_finds_overlapping_examples(registry):
+    registry.register_custom_function(name="short", func=lambda: 1, description="Short", examples=["alpha beta"])
+    registry.register_custom_function(name="long", func=lambda: 1, description="Long", examples=["beta gamma delta"])
+
+    # A plain scan would consume "alpha beta" and never see the longer example starting inside it
+    assert registry.match_example("alpha beta gamma delta") == "long"
+
+def test_match_example_sees_functions_registered_later(registry):
+    assert registry.match_example("launch the rocket") is None
+
+    registry.register_custom_function(name="rocket", func=lambda: 1, description="Rocket", examples=["Launch the rocket"])
+    assert registry.match_example("launch the rocket") == "rocket"
+
+def test_delete_files_across_directories(registry, tmp_path, monkeypatch):
+    (tmp_path / "sub").mkdir()
+    paths = [tmp_path / "a.txt", tmp_path / "sub" / "b.txt", tmp_path / "c.txt"]
+    for path in paths:
+        path.write_text("x")
+    (tmp_path / "keep.txt").write_text("x")
+    # Bare file names are resolved against the working directory
+    monkeypatch.chdir(tmp_path / "sub")
+    (tmp_path / "sub" / "d.txt").write_text("x")
+
+    assert registry._delete_files([str(p) for p in paths] + ["d.txt"]) is True
+    assert sorted(p.name for p in tmp_path.rglob("*.txt")) == ["keep.txt"]
+
+def test_delete_files_without_dir_fd_support(registry, tmp_path, monkeypatch):
+    monkeypatch.setattr("os.supports_dir_fd", set())
+    path = tmp_path / "a.txt"
+    path.write_text("x")
+
+    registry._delete_files([str(path)])
+    assert not path.exists()
+
+def test_delete_files_raises_for_missing_files(registry, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        registry._delete_files([str(tmp_path / "missing.txt")])
+
+def test_first_cpu_reading_is_sampled(registry, monkeypatch):
+    monkeypatch.setattr("psutil.cpu_percent", lambda interval=None: 42.0)
+
+    # Straight after construction, inside the 100 ms reuse window
+    assert orjson.loads(registry._get_cpu_usage().text)["cpu_percent"] == "42.00%"
@@ -0,0 +1,36 @@
+import pytest
+from app.services import rag_service
+from app.services.function_registry import FunctionRegistry
+from app.services.rag_service import RAGService
+
+@pytest.fixture
+def registry(monkeypatch):
+    # A fresh registry, so registering custom functions does not leak into other tests
+    registry = FunctionRegistry()
+    monkeypatch.setattr(rag_service, "get_function_registry", lambda: registry)
+    return registry
+
+@pytest.mark.parametrize("prompt, expected", [
+    ("Show CPU usage", "get_cpu_usage"),
+    ("What time is it", "get_current_time"),
+    ("Open calculator", "open_calculator"),
+    ("check disk usage", "get_disk_usage"),
+])
+def test_short_keyword_prompts_dispatch(registry, prompt, expected):
+    assert RAGService._dispatch_keyword(prompt.lower()) == expected
+
+@pytest.mark.parametrize("prompt", [
+    # Words from another function's name
+    "delete data.txt from disk",
+    "Erase the file called date.csv",
+    # Keywords of two functions
+    "how much time is left on my disk",
+    # Too long to be just the keyword
+    "can you tell me how busy the cpu has been lately",
+])
+def test_ambiguous_prompts_are_not_dispatched(registry, prompt):
+    assert RAGService._dispatch_keyword(prompt.lower()) is None
+
+def test_custom_functions_disable_dispatch(registry):
+    registry.register_custom_function(name="cpu_temperature", func=lambda: 42, description="CPU temperature")
+    assert RAGService._dispatch_keyword("show cpu temperature") is None
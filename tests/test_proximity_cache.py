@@ -0,0 +1,33 @@
+import numpy as np
+from app.services.proximity_cache import ProximityCache
+
+def test_proximity_cache_hit_and_miss():
+    cache = ProximityCache(tau=0.05, capacity=4)
+    cache.put(np.array([1.0, 0.0]), "first")
+
+    # Near-duplicate embedding hits
+    assert cache.get(np.array([0.99, 0.01])) == "first"
+
+    # Orthogonal embedding misses
+    assert cache.get(np.array([0.0, 1.0])) is None
+
+def test_proximity_cache_evicts_least_recently_used():
+    cache = ProximityCache(tau=0.01, capacity=2)
+    cache.put(np.array([1.0, 0.0]), "a")
+    cache.put(np.array([0.0, 1.0]), "b")
+
+    # Touch "a" so "b" becomes the eviction candidate
+    assert cache.get(np.array([1.0, 0.0])) == "a"
+    cache.put(np.array([-1.0, 0.0]), "c")
+
+    assert cache.get(np.array([0.0, 1.0])) is None
+    assert cache.get(np.array([1.0, 0.0])) == "a"
+    assert cache.get(np.array([-1.0, 0.0])) == "c"
+
+def test_proximity_cache_replaces_near_duplicate():
+    cache = ProximityCache(tau=0.05, capacity=4)
+    cache.put(np.array([1.0, 0.0]), "old")
+    cache.put(np.array([0.99, 0.01]), "new")
+
+    assert cache.get(np.array([1.0, 0.0])) == "new"
+    assert len(cache.values) == 1